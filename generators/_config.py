@@ -0,0 +1,59 @@
+"""
+Shared config loader for the wallselect generator scripts.
+
+Parses one section of config.ini with configparser and converts each value
+to the type of its default (bool, float or str), so callers never compare
+strings.
+"""
+
+import os
+import sys
+
+# Resolved once at import; used when no --config path is given
+DEFAULT_CONFIG = os.path.expanduser("~/.config/wallselect/config.ini")
+BOOL_TRUE = frozenset(("true", "1", "yes", "on"))
+
+def read_section(path, section):
+    """Parse an INI file and return one section as a dict of raw strings."""
+    # Imported here: configparser is only needed when a config file is actually read
+    import configparser
+
+    parser = configparser.ConfigParser(interpolation=None, strict=False)
+    # open() rather than parser.read() so a missing file raises instead of parsing as empty
+    with open(path) as f:
+        parser.read_file(f)
+    return dict(parser[section]) if parser.has_section(section) else {}
+
+def coerce_value(value, default):
+    """Convert a config string to the type of its default value."""
+    if isinstance(default, bool):
+        return value.lower() in BOOL_TRUE
+    if isinstance(default, float):
+        return float(value) if value else default
+    return value
+
+def load_section(path, section, defaults):
+    """Load one config section merged over the given defaults.
+
+    Without a config file the (read-only) defaults mapping itself is returned.
+    """
+    if not path:
+        return defaults
+
+    # Open the file directly instead of checking it exists first
+    try:
+        values = read_section(path, section)
+    except FileNotFoundError:
+        return defaults
+    except Exception as e:
+        print(f"Error loading config: {e}", file=sys.stderr)
+        return defaults
+
+    settings = dict(defaults)
+    for key, value in values.items():
+        try:
+            settings[key] = coerce_value(value, defaults.get(key, ""))
+        except ValueError:
+            print(f"Error loading config: invalid value for {key}: {value}", file=sys.stderr)
+
+    return settings
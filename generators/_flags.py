@@ -0,0 +1,39 @@
+"""
+Table-driven translation of CLI arguments and config settings into tool flags.
+
+Each table entry is (arg_attr, setting_key, cli_flag, kind, default), where kind is:
+  "bool"    append cli_flag when the argument or setting is true
+  "float"   append cli_flag and the value
+  "float>0" append cli_flag and the value only when it is positive
+  "str"     append cli_flag and the value when it is non-empty
+
+Settings are expected to be already typed by _config.load_section (bools and
+floats rather than strings). A setting_key of None means the flag can only be
+enabled from the command line.
+"""
+
+def resolve_value(args, attr, settings, key, kind, default):
+    """Pick the argument value if given, otherwise the setting, otherwise the default."""
+    value = getattr(args, attr, None)
+    if kind == "str":
+        return value or settings.get(key) or default
+    if value is not None:
+        return value
+    return settings.get(key, default)
+
+def apply_flags(cmd, args, settings, table):
+    """Append the flags described by table to cmd."""
+    for attr, key, flag, kind, default in table:
+        if kind == "bool":
+            if getattr(args, attr, False) or (key is not None and settings[key]):
+                cmd.append(flag)
+            continue
+
+        value = resolve_value(args, attr, settings, key, kind, default)
+        if kind == "float>0" and value <= 0:
+            continue
+        if kind == "str" and not value:
+            continue
+        cmd.extend((flag, str(value)))
+
+    return cmd
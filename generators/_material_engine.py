@@ -0,0 +1,113 @@
+"""
+Material You color extraction pipeline for the material generator.
+
+Holds everything that needs Pillow, NumPy and materialyoucolor, so that
+material.py can answer from its cache or a running daemon without paying
+for these imports.
+"""
+
+import sys
+import math
+import functools
+from typing import Optional, Tuple
+import numpy as np
+from PIL import Image
+
+# Try to import the materialyoucolor library
+try:
+    from materialyoucolor.quantize import QuantizeCelebi
+    from materialyoucolor.hct import Hct
+    from materialyoucolor.scheme.scheme_tonal_spot import SchemeTonalSpot
+    from materialyoucolor.dynamiccolor.material_dynamic_colors import MaterialDynamicColors
+    from materialyoucolor.score.score import Score
+except ImportError:
+    print("Error: materialyoucolor library not found.")
+    print("Please install it with: pip install materialyoucolor")
+    sys.exit(1)
+
+# Pixels are always handled as RGB
+CHANNELS = 3
+
+# Only every Nth pixel of the resized image is passed to the quantizer
+SAMPLE_STRIDE = 4
+
+# Below this summed per-channel standard deviation the image is treated as one color
+UNIFORM_STD_THRESHOLD = 12.0
+
+# Dynamic color descriptors are fixed at import time, so collect them once
+_DYNAMIC_COLORS = [
+    (name, getattr(MaterialDynamicColors, name))
+    for name in vars(MaterialDynamicColors)
+    if hasattr(getattr(MaterialDynamicColors, name), "get_hct")
+]
+
+def rgba_to_hex(rgba: list) -> str:
+    """Convert RGBA values to hex color code."""
+    return "#{:02x}{:02x}{:02x}".format(*rgba)
+
+def fit_or_none(width: int, height: int, target: int = 128) -> Optional[Tuple[int, int]]:
+    """Return the size scaling the image area down to target**2, or None if already small enough."""
+    image_area = width * height
+    bitmap_area = target * target
+    if image_area <= bitmap_area:
+        return None
+    scale = math.sqrt(bitmap_area / image_area)
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+def load_pixels(path: str) -> np.ndarray:
+    """Load an image as an (N, CHANNELS) array of RGB pixels sized for quantization."""
+    image = Image.open(path)
+    new_size = fit_or_none(*image.size)
+    if new_size:
+        # Let the JPEG decoder downscale during decode (no-op for other formats)
+        image.draft("RGB", new_size)
+
+    # Canonical RGB before anything else: palette, grayscale and RGBA images all become 3 channels
+    image = image.convert("RGB")
+    if new_size:
+        image = image.resize(new_size, Image.Resampling.BILINEAR)
+
+    # One C-level copy of the pixel buffer instead of indexing getdata() per pixel
+    pixels = np.asarray(image, dtype=np.uint8).reshape(-1, CHANNELS)
+
+    # A uniform subsample is enough to find the seed color and cuts quantizer work
+    return pixels[::SAMPLE_STRIDE]
+
+@functools.lru_cache(maxsize=256)
+def _build_palette(argb: int, dark_mode: bool) -> dict:
+    """Build the color scheme for a seed color; many wallpapers share a seed."""
+    hct = Hct.from_int(argb)
+    scheme = SchemeTonalSpot(hct, dark_mode, 0.0)
+
+    material_colors = {}
+    for name, dynamic_color in _DYNAMIC_COLORS:
+        rgba = dynamic_color.get_hct(scheme).to_rgba()
+        material_colors[name] = rgba_to_hex(rgba)
+
+    return material_colors
+
+def seed_color(pixels: np.ndarray) -> int:
+    """Pick the ARGB seed color for a set of pixels."""
+    # Near-uniform wallpapers: the mean color is as good a seed as the quantizer's pick
+    if pixels.std(axis=0).sum() < UNIFORM_STD_THRESHOLD:
+        r, g, b = (int(c) for c in pixels.mean(axis=0).round())
+        return (0xFF << 24) | (r << 16) | (g << 8) | b
+
+    colors = QuantizeCelebi(pixels.tolist(), 128)
+    return Score.score(colors)[0]
+
+def colors_from_pixels(pixels: np.ndarray, dark_mode: bool = True) -> dict:
+    """Build the Material You color scheme seeded from the given pixels."""
+    argb = seed_color(pixels)
+
+    # Copy so callers cannot mutate the cached palette
+    return dict(_build_palette(argb, dark_mode))
+
+def compute_colors(path: str, dark_mode: bool = True) -> dict:
+    """Extract Material You colors from an image file."""
+    return colors_from_pixels(load_pixels(path), dark_mode)
+
+def prewarm() -> None:
+    """Run the pipeline once on a tiny buffer so the first real request pays no setup cost."""
+    pixels = np.random.default_rng(0).integers(0, 256, (64, CHANNELS), dtype=np.uint8)
+    colors_from_pixels(pixels, True)
@@ -0,0 +1,34 @@
+"""
+Shared helpers for handing a built command line over to a color tool.
+
+Normal runs replace the wrapper process with the tool (exec_tool); debug runs
+keep it as a child so the wrapper can report on it afterwards (run_tool).
+"""
+
+import os
+import sys
+import subprocess
+
+def run_tool(cmd, name, quiet=False):
+    """Run a tool as a child, streaming its output, and return whether it succeeded."""
+    try:
+        # Print the command for debugging
+        print(f"Running {name}: {' '.join(cmd)}", flush=True)
+
+        # Inherit our stdout/stderr so output streams live; drop stdout when quiet
+        stdout = subprocess.DEVNULL if quiet else None
+        return subprocess.Popen(cmd, stdout=stdout).wait() == 0
+    except Exception as e:
+        print(f"Error running {name}: {e}", file=sys.stderr)
+        return False
+
+def exec_tool(cmd, name):
+    """Replace this process with a tool, inheriting stdout and stderr."""
+    try:
+        # stdout is None when the script was started with it closed
+        if sys.stdout is not None:
+            sys.stdout.flush()
+        os.execvp(cmd[0], cmd)
+    except OSError as e:
+        print(f"Error running {name}: {e}", file=sys.stderr)
+        sys.exit(1)
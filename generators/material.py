@@ -2,86 +2,230 @@
 """
 Material Generator integration for wallselect.
 Extracts Material You colors from a wallpaper image.
+
+With --daemon the extraction pipeline stays loaded and serves requests on a
+UNIX socket; one-shot runs use it when it is up and fall back to extracting
+colors in-process otherwise.
 """
 
 import os
 import sys
-import math
-import argparse
 import json
-from PIL import Image
+import signal
+import socket
+import hashlib
+import functools
+import argparse
 
-# Try to import the materialyoucolor library
+# xxhash is optional; blake2b from hashlib is used when it is missing
 try:
-    from materialyoucolor.quantize import QuantizeCelebi
-    from materialyoucolor.hct import Hct
-    from materialyoucolor.scheme.scheme_tonal_spot import SchemeTonalSpot
-    from materialyoucolor.dynamiccolor.material_dynamic_colors import MaterialDynamicColors
-    from materialyoucolor.score.score import Score
+    import xxhash
 except ImportError:
-    print("Error: materialyoucolor library not found.")
-    print("Please install it with: pip install materialyoucolor")
-    sys.exit(1)
+    xxhash = None
+
+# orjson is optional; the stdlib json encoder is used when it is missing
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Define constants
 CACHE_DIR = os.path.expanduser("~/.cache/wallpapers/material")
 os.makedirs(CACHE_DIR, exist_ok=True)
 
-def rgba_to_hex(rgba: list) -> str:
-    """Convert RGBA values to hex color code."""
-    return "#{:02x}{:02x}{:02x}".format(*rgba)
-
-def calculate_optimal_size(width: int, height: int, bitmap_size: int) -> tuple:
-    """Calculate optimal image size for color extraction."""
-    image_area = width * height
-    bitmap_area = bitmap_size**2
-    scale = math.sqrt(bitmap_area / image_area) if image_area > bitmap_area else 1
-    new_width = round(width * scale)
-    new_height = round(height * scale)
-    if new_width == 0:
-        new_width = 1
-    if new_height == 0:
-        new_height = 1
-    return new_width, new_height
+# Socket of the long-lived material daemon (see --daemon). It only lives in the
+# per-user $XDG_RUNTIME_DIR; without one the daemon is disabled rather than
+# exposed under a shared, guessable path.
+RUNTIME_DIR = os.environ.get("XDG_RUNTIME_DIR")
+SOCKET_PATH = os.path.join(RUNTIME_DIR, "wallselect-material.sock") if RUNTIME_DIR else None
+DAEMON_TIMEOUT = 30
+
+# The daemon serves one client at a time, so a request must arrive promptly and be short
+REQUEST_TIMEOUT = 5
+MAX_REQUEST_BYTES = 4096
+
+# Entries kept by the in-process (path, mtime_ns, size) -> content hash memo
+HASH_CACHE_SIZE = 512
+
+@functools.lru_cache(maxsize=HASH_CACHE_SIZE)
+def _content_hash(path: str, mtime_ns: int, size: int) -> str:
+    """Hash a file's contents; the stat fields only key the memo."""
+    with open(path, "rb") as f:
+        data = f.read()
+    if xxhash is not None:
+        return xxhash.xxh3_64_hexdigest(data)
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+def file_hash(path: str) -> str:
+    """Return a content hash of the file, memoized on its stat signature."""
+    st = os.stat(path)
+    return _content_hash(path, st.st_mtime_ns, st.st_size)
+
+def cached_colors_path(path: str, dark_mode: bool) -> str:
+    """Return the cache file holding the colors extracted from an image."""
+    mode = "dark" if dark_mode else "light"
+    return f"{CACHE_DIR}/{file_hash(path)}-{mode}.json"
+
+def load_cached_colors(cache_path: str) -> dict:
+    """Load previously extracted colors, or None on a cache miss."""
+    try:
+        with open(cache_path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def encode_colors(colors: dict, pretty: bool = False) -> bytes:
+    """Serialize colors to JSON, compact unless pretty output is requested."""
+    if pretty:
+        return json.dumps(colors, indent=2).encode()
+    if orjson is not None:
+        return orjson.dumps(colors)
+    return json.dumps(colors, separators=(",", ":")).encode()
+
+def write_atomic(path: str, data: bytes) -> None:
+    """Write a file via a temp file and rename, so readers never see a partial file."""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+def save_cached_colors(cache_path: str, colors: dict) -> None:
+    """Store extracted colors so the same image is never quantized twice."""
+    try:
+        write_atomic(cache_path, encode_colors(colors))
+    except OSError as e:
+        print(f"Warning: could not write color cache: {e}", file=sys.stderr)
 
 def get_colors_from_img(path: str, dark_mode: bool = True) -> dict:
     """Extract Material You colors from an image."""
     # Always use dark mode for consistency
     dark_mode = True
-    
-    image = Image.open(path)
-    wsize, hsize = image.size
-    wsize_new, hsize_new = calculate_optimal_size(wsize, hsize, 128)
-    if wsize_new < wsize or hsize_new < hsize:
-        image = image.resize((wsize_new, hsize_new), Image.Resampling.BICUBIC)
 
-    pixel_len = image.width * image.height
-    image_data = image.getdata()
-    pixel_array = [image_data[_] for _ in range(0, pixel_len, 1)]
+    cache_path = cached_colors_path(path, dark_mode)
+    material_colors = load_cached_colors(cache_path)
+    if material_colors is not None:
+        return material_colors
+
+    # Imported lazily: cache hits and daemon clients never load Pillow or materialyoucolor
+    from _material_engine import compute_colors
 
-    colors = QuantizeCelebi(pixel_array, 128)
-    argb = Score.score(colors)[0]
+    material_colors = compute_colors(path, dark_mode)
+    save_cached_colors(cache_path, material_colors)
+    return material_colors
 
-    hct = Hct.from_int(argb)
-    scheme = SchemeTonalSpot(hct, dark_mode, 0.0)
+def request_colors(path: str, socket_path: str = SOCKET_PATH) -> dict:
+    """Ask a running material daemon for the colors of an image, or None if none answers."""
+    if socket_path is None:
+        return None
 
-    material_colors = {}
-    for color in vars(MaterialDynamicColors).keys():
-        color_name = getattr(MaterialDynamicColors, color)
-        if hasattr(color_name, "get_hct"):
-            rgba = color_name.get_hct(scheme).to_rgba()
-            material_colors[color] = rgba_to_hex(rgba)
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(DAEMON_TIMEOUT)
+            client.connect(socket_path)
+            client.sendall(os.path.abspath(path).encode() + b"\n")
+            client.shutdown(socket.SHUT_WR)
+            with client.makefile("rb") as stream:
+                reply = json.loads(stream.read())
+    except (OSError, ValueError):
+        return None
+    return reply.get("colors")
 
-    return material_colors
+def daemon_running(socket_path: str = SOCKET_PATH) -> bool:
+    """Return whether a daemon is accepting connections on the socket."""
+    if socket_path is None:
+        return False
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            probe.connect(socket_path)
+        return True
+    except OSError:
+        return False
+
+def handle_request(conn: socket.socket) -> None:
+    """Answer one daemon request: read an image path, send back its colors as JSON."""
+    # A client that connects and sends nothing must not stall the daemon
+    conn.settimeout(REQUEST_TIMEOUT)
+    try:
+        with conn.makefile("rb") as stream:
+            line = stream.readline(MAX_REQUEST_BYTES + 1)
+    except OSError:
+        return
+    if len(line) > MAX_REQUEST_BYTES:
+        return
+
+    path = line.decode(errors="replace").strip()
+    if not path:
+        return
+
+    try:
+        reply = {"colors": get_colors_from_img(path, True)}
+    except Exception as e:
+        reply = {"error": str(e)}
+
+    try:
+        conn.sendall(json.dumps(reply).encode())
+    except OSError:
+        pass
 
-def extract_colors(wallpaper_path: str, output_path: str = None) -> str:
+def serve_daemon(socket_path: str = SOCKET_PATH) -> bool:
+    """Keep the extraction pipeline loaded and serve requests on a UNIX socket.
+
+    Returns False when the daemon cannot run because XDG_RUNTIME_DIR is unset.
+    """
+    if socket_path is None:
+        print("Error: XDG_RUNTIME_DIR is not set; refusing to start the material daemon", file=sys.stderr)
+        return False
+
+    if daemon_running(socket_path):
+        print(f"Material daemon already running on {socket_path}")
+        return True
+
+    from _material_engine import prewarm
+    prewarm()
+
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+
+    # Exit through the finally block below on SIGTERM so the socket file is removed
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+        # Create the socket file owner-only from the start instead of chmod-ing it after bind
+        old_umask = os.umask(0o177)
+        try:
+            server.bind(socket_path)
+        finally:
+            os.umask(old_umask)
+        server.listen()
+        print(f"Material daemon listening on {socket_path}")
+        try:
+            while True:
+                conn, _ = server.accept()
+                with conn:
+                    handle_request(conn)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.unlink(socket_path)
+
+    return True
+
+def extract_colors(wallpaper_path: str, output_path: str = None, pretty: bool = False) -> str:
     """Extract colors from wallpaper and save to JSON file."""
     if not os.path.isfile(wallpaper_path):
         print(f"Error: Wallpaper file not found: {wallpaper_path}")
         return None
 
-    # Extract colors from the wallpaper
-    colors = get_colors_from_img(wallpaper_path, True)
+    # Extract colors from the wallpaper, preferring a running daemon
+    colors = request_colors(wallpaper_path)
+    if colors is None:
+        colors = get_colors_from_img(wallpaper_path, True)
     
     # Create the output directory if it doesn't exist
     if not output_path:
@@ -90,8 +234,7 @@ def extract_colors(wallpaper_path: str, output_path: str = None) -> str:
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
     
     # Save colors to JSON file
-    with open(output_path, 'w') as f:
-        json.dump(colors, f, indent=2)
+    write_atomic(output_path, encode_colors(colors, pretty))
     
     print(f"Material colors extracted and saved to: {output_path}")
     return output_path
@@ -102,6 +245,8 @@ if __name__ == "__main__":
     parser.add_argument("--image", help="Path to the wallpaper image")
     parser.add_argument("--config", help="Path to the configuration file (ignored)")
     parser.add_argument("--output", default=f"{CACHE_DIR}/colors.json", help="Output JSON file path")
+    parser.add_argument("--pretty", action="store_true", help="Indent the output JSON for reading")
+    parser.add_argument("--daemon", action="store_true", help="Serve color requests on a socket in $XDG_RUNTIME_DIR")
     
     # Also support positional argument for backward compatibility
     parser.add_argument("wallpaper", nargs="?", help="Path to the wallpaper image (alternative to --image)")
@@ -109,6 +254,9 @@ if __name__ == "__main__":
     # Parse known args to handle unknown arguments gracefully
     args, unknown = parser.parse_known_args()
     
+    if args.daemon:
+        sys.exit(0 if serve_daemon() else 1)
+    
     # Determine wallpaper path (prefer --image if provided)
     wallpaper_path = args.image if args.image else args.wallpaper
     
@@ -116,7 +264,7 @@ if __name__ == "__main__":
         print("Error: No wallpaper path provided. Use --image or provide as positional argument.")
         sys.exit(1)
     
-    output_path = extract_colors(wallpaper_path, args.output)
+    output_path = extract_colors(wallpaper_path, args.output, args.pretty)
     
     if output_path:
         print(f"Material colors extracted and saved to: {output_path}")
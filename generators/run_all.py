@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Run-All Generator Script for Wallselect
+
+Runs every enabled color generator from generators.conf in parallel.
+Each generator is a separate process, so a thread pool is only used to
+wait on them; total time is that of the slowest generator instead of the sum.
+
+Use it like any other generator, e.g. `wallselect.sh random run_all`.
+"""
+
+import os
+import sys
+import argparse
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+GENERATOR_CONFIG = os.path.expanduser("~/.config/wallpaper-switcher/generators.conf")
+SELF_NAME = "run_all"
+
+def parse_arguments():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Run all enabled color generators in parallel")
+    parser.add_argument("--image", "-i", required=True, help="Path to the wallpaper image")
+    parser.add_argument("--config", "-c", help="Path to config file (optional)")
+    parser.add_argument("--generators", "-g", default=GENERATOR_CONFIG, help="Path to generators.conf")
+    return parser.parse_args()
+
+def find_generator_script(name):
+    """Find the executable script for a generator next to this one."""
+    for ext in ("py", "sh"):
+        script_path = os.path.join(SCRIPT_DIR, f"{name}.{ext}")
+        if os.path.isfile(script_path) and os.access(script_path, os.X_OK):
+            return script_path
+    return None
+
+def load_enabled_generators(generators_path):
+    """Return the scripts of all enabled generators, ordered by priority."""
+    enabled = []
+    try:
+        with open(generators_path, "r") as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+
+                parts = line.split(":")
+                if len(parts) != 3 or parts[0] == SELF_NAME or parts[1] != "true":
+                    continue
+
+                script_path = find_generator_script(parts[0])
+                if script_path:
+                    priority = int(parts[2]) if parts[2].isdigit() else 0
+                    enabled.append((priority, parts[0], script_path))
+    except FileNotFoundError:
+        print(f"Error: generator config not found: {generators_path}", file=sys.stderr)
+
+    return [(name, script_path) for _, name, script_path in sorted(enabled)]
+
+def build_generator_command(script_path, image, config_path):
+    """Build the command for one generator, matching wallselect.sh."""
+    if script_path.endswith(".sh"):
+        return [script_path, image]
+
+    cmd = [sys.executable, script_path, "--image", image]
+    if config_path:
+        cmd.extend(("--config", config_path))
+    return cmd
+
+def run_generator(name, cmd):
+    """Run one generator with inherited stdio and report whether it succeeded."""
+    try:
+        return name, subprocess.Popen(cmd).wait() == 0
+    except OSError as e:
+        print(f"Error running {name}: {e}", file=sys.stderr)
+        return name, False
+
+def run_all(generators, image, config_path):
+    """Run the given generators concurrently and return the names that failed."""
+    with ThreadPoolExecutor(max_workers=len(generators)) as pool:
+        futures = [
+            pool.submit(run_generator, name, build_generator_command(script_path, image, config_path))
+            for name, script_path in generators
+        ]
+        return [name for name, ok in (future.result() for future in futures) if not ok]
+
+def main():
+    """Main function."""
+    args = parse_arguments()
+
+    generators = load_enabled_generators(args.generators)
+    if not generators:
+        print("Error: no enabled generators found", file=sys.stderr)
+        sys.exit(1)
+
+    failed = run_all(generators, args.image, args.config)
+    for name in failed:
+        print(f"Warning: {name} generator failed", file=sys.stderr)
+
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
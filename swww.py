@@ -1,229 +1,401 @@
 #!/usr/bin/env python3
 import random
-import subprocess
+import bisect
+import functools
 import sys
 import os
-import time
-import json
-from pathlib import Path
+from types import SimpleNamespace
+from itertools import accumulate
 
-def exec_async(command):
-    """Execute a command asynchronously"""
-    subprocess.Popen(command)
-
-def create_swww_command(image_path, options):
-    """Create the swww command with options"""
-    command = ["swww", "img", image_path]
-
-    if options.get("noResize"):
-        command.append("--no-resize")
-
-    if options.get("resize"):
-        command.extend(["--resize", options["resize"]])
-
-    if options.get("fillColor"):
-        command.extend(["--fill-color", options["fillColor"]])
-
-    if options.get("filter"):
-        command.extend(["-f", options["filter"]])
-
-    if options.get("transitionType"):
-        command.extend(["--transition-type", options["transitionType"]])
-
-    if options.get("transitionStep") is not None:
-        command.extend(["--transition-step", str(options["transitionStep"])])
-
-    if options.get("transitionDuration") is not None:
-        command.extend(["--transition-duration", str(options["transitionDuration"])])
+# Informational banners are only written when someone is watching the terminal;
+# sys.stdout is None when the script was started with stdout closed
+_TTY = sys.stdout is not None and sys.stdout.isatty()
 
-    if options.get("transitionFps") is not None:
-        command.extend(["--transition-fps", str(options["transitionFps"])])
+def _reap(pid):
+    """Wait for a detached child so it does not linger as a zombie"""
+    try:
+        os.waitpid(pid, 0)
+    except ChildProcessError:
+        pass
 
-    if options.get("transitionAngle") is not None:
-        command.extend(["--transition-angle", str(options["transitionAngle"])])
+def exec_async(command):
+    """Execute a command asynchronously, detached into its own process group"""
+    # posix_spawnp skips Popen's pipe and bookkeeping setup; the child keeps our
+    # stdout/stderr so swww errors still reach the terminal
+    pid = os.posix_spawnp(command[0], command, os.environ, setpgroup=0)
+
+    # Imported here so importers that never spawn detached commands skip threading
+    import threading
+    threading.Thread(target=_reap, args=(pid,), daemon=True).start()
+    return pid
+
+# (option key, swww flag, formatter); a formatter of None marks a bare boolean flag
+_FLAG_SPEC = (
+    ("noResize",           "--no-resize",           None),
+    ("resize",             "--resize",              str),
+    ("fillColor",          "--fill-color",          str),
+    ("filter",             "-f",                    str),
+    ("transitionType",     "--transition-type",     str),
+    ("transitionStep",     "--transition-step",     str),
+    ("transitionDuration", "--transition-duration", str),
+    ("transitionFps",      "--transition-fps",      str),
+    ("transitionAngle",    "--transition-angle",    str),
+    ("transitionPos",      "--transition-pos",      str),
+)
+
+@functools.lru_cache(maxsize=128)
+def _create_swww_command_cached(image_path, option_items):
+    """Build the swww command for a frozen set of (key, type, value) option items"""
+    options = {key: value for key, _, value in option_items}
+    command = ["swww", "img", image_path]
 
-    if options.get("transitionPos"):
-        command.extend(["--transition-pos", options["transitionPos"]])
+    for key, flag, formatter in _FLAG_SPEC:
+        value = options.get(key)
+        if formatter is None:
+            if value:
+                command.append(flag)
+        # Zero is a valid step/angle, so only missing or empty values are skipped
+        elif value is not None and value != "":
+            command.extend((flag, formatter(value)))
 
-    return command
+    return tuple(command)
 
-def generate_random_swww_options():
-    """Generate random transition options for swww with enhanced variety"""
-    def get_random_element(arr):
-        return arr[random.randint(0, len(arr) - 1)]
-
-    # Expanded transition types with more variety
-    transition_types = [
-        # Basic directional transitions
-        "fade", "left", "right", "top", "bottom",
-
-        # Advanced transitions
-        "wipe", "wave", "grow", "center", "outer",
-
-        # Diagonal transitions
-        "top-left", "top-right", "bottom-left", "bottom-right",
-
-        # Circular/radial transitions
-        "center-out", "outer-in",
-
-        # Complex transitions
-        "spiral", "diamond", "hexagon"
-    ]
-
-    # More diverse position options
-    positions = [
-        # Corner positions
-        "center", "top", "left", "right", "bottom",
-        "top-left", "top-right", "bottom-left", "bottom-right",
-
-        # Edge midpoints
-        "top-center", "bottom-center", "left-center", "right-center",
-
-        # Quarter positions
-        "quarter-top-left", "quarter-top-right",
-        "quarter-bottom-left", "quarter-bottom-right",
-
-        # Random coordinates (0-100 range)
-        f"{random.randint(10, 90)},{random.randint(10, 90)}",
-        f"{random.randint(0, 50)},{random.randint(0, 50)}",
-        f"{random.randint(50, 100)},{random.randint(50, 100)}"
-    ]
-
-    # Resize options with weights (crop is most common)
-    resize_options = ["crop", "crop", "crop", "fit", "no"]  # Weighted towards crop
-
-    # Filter options for visual effects
-    filters = [
-        None, None, None,  # Most of the time no filter
-        "Lanczos3", "Mitchell", "CatmullRom", "Triangle", "Gaussian"
-    ]
-
-    # Fill colors for letterboxing
-    fill_colors = [
-        None, None,  # Usually no fill color
-        "#000000", "#FFFFFF", "#1a1a1a", "#2d2d2d",
-        "#0f0f0f", "#333333", "#404040"
-    ]
+def create_swww_command(image_path, options):
+    """Create the swww command with options"""
+    # The value type is part of the key so 1 and 1.0 do not share a cached "1"
+    option_items = frozenset((key, type(value), value) for key, value in options.items())
+    # Callers may mutate the result, so hand out a fresh list each time
+    return list(_create_swww_command_cached(image_path, option_items))
+
+# Static choice tables for generate_random_swww_options
+# Expanded transition types with more variety, shared with list_available_transitions
+_ALL_TRANSITIONS = (
+    # Basic directional transitions
+    "fade", "left", "right", "top", "bottom",
+
+    # Advanced transitions
+    "wipe", "wave", "grow", "center", "outer",
+
+    # Diagonal transitions
+    "top-left", "top-right", "bottom-left", "bottom-right",
+
+    # Circular/radial transitions
+    "center-out", "outer-in",
+
+    # Complex transitions
+    "spiral", "diamond", "hexagon"
+)
+
+# Transitions that benefit from varied angles vs. ones that work well with cardinal angles
+_ANGLE_FREE = frozenset(("wipe", "wave", "spiral"))
+_ANGLE_CARDINAL = frozenset(("grow", "center", "outer"))
+_CARDINAL_ANGLES = (0, 45, 90, 135, 180, 225, 270, 315)
+
+# More diverse position options
+_POSITIONS_STATIC = (
+    # Corner positions
+    "center", "top", "left", "right", "bottom",
+    "top-left", "top-right", "bottom-left", "bottom-right",
+
+    # Edge midpoints
+    "top-center", "bottom-center", "left-center", "right-center",
+
+    # Quarter positions
+    "quarter-top-left", "quarter-top-right",
+    "quarter-bottom-left", "quarter-bottom-right"
+)
+
+# Random coordinates (0-100 range), one position entry per range. Indices past the
+# static positions act as sentinels for these, so one draw picks either kind.
+_COORD_RANGES = ((10, 90), (0, 50), (50, 100))
+_POSITION_COUNT = len(_POSITIONS_STATIC) + len(_COORD_RANGES)
+
+# Resize options with weights (crop is most common)
+_RESIZE_POP = ("crop", "fit", "no")
+_RESIZE_W = (3, 1, 1)
+
+# Filter options for visual effects (most of the time no filter)
+_FILTER_POP = (None, "Lanczos3", "Mitchell", "CatmullRom", "Triangle", "Gaussian")
+_FILTER_W = (3, 1, 1, 1, 1, 1)
+
+# Fill colors for letterboxing (usually no fill color)
+_FILL_POP = (
+    None,
+    "#000000", "#FFFFFF", "#1a1a1a", "#2d2d2d",
+    "#0f0f0f", "#333333", "#404040"
+)
+_FILL_W = (2, 1, 1, 1, 1, 1, 1, 1)
+
+# Cumulative weights, so a single uniform draw plus a bisect picks a weighted entry
+_RESIZE_CDF = tuple(accumulate(_RESIZE_W))
+_FILTER_CDF = tuple(accumulate(_FILTER_W))
+_FILL_CDF = tuple(accumulate(_FILL_W))
+
+def _weighted_pick(population, cdf, draw, _bisect=bisect.bisect):
+    """Pick a weighted entry from population using a non-negative random integer draw"""
+    return population[_bisect(cdf, draw % cdf[-1])]
+
+_TRANSITION_STEPS = (
+    # Fast transitions
+    200, 220, 240, 255,
+    # Medium transitions
+    120, 140, 160, 180,
+    # Slow transitions (less common)
+    60, 80, 100
+)
+
+_TRANSITION_DURATIONS = (
+    # Quick transitions (most common)
+    0.5, 0.8, 1.0, 1.2, 1.5,
+    # Medium transitions
+    2.0, 2.5, 3.0,
+    # Slow transitions (rare)
+    4.0, 5.0
+)
+
+# High FPS (smooth)
+_TRANSITION_FPS = (60, 60, 60)
+
+# swww takes every value as a string, so the numbers the generators can pick are
+# stringified once here rather than on every command build
+_STEP_STRS = tuple(map(str, range(256)))
+_ANGLE_STRS = tuple(map(str, range(360)))
+_DURATION_STRS = tuple(map(str, _TRANSITION_DURATIONS))
+_FPS_STRS = tuple(map(str, _TRANSITION_FPS))
+
+# Bit layout for generate_random_swww_options: eight table fields plus one angle field
+_FIELD_BITS = 12
+_FIELD_MASK = (1 << _FIELD_BITS) - 1
+_ANGLE_BITS = 16
+_ANGLE_MASK = (1 << _ANGLE_BITS) - 1
+_RANDOM_BITS = 8 * _FIELD_BITS + _ANGLE_BITS
+
+def random_transition_position(draw=None):
+    """Pick a transition position, only building a coordinate string when one is chosen
+
+    draw is a non-negative random integer selecting the entry; one is made when omitted.
+    """
+    if draw is None:
+        draw = random.getrandbits(_FIELD_BITS)
+    index = draw % _POSITION_COUNT
+    if index < len(_POSITIONS_STATIC):
+        return _POSITIONS_STATIC[index]
+    low, high = _COORD_RANGES[index - len(_POSITIONS_STATIC)]
+    return f"{random.randint(low, high)},{random.randint(low, high)}"
+
+def _draw_random_fields():
+    """Draw every field of a random transition, in swww flag order
+
+    Returns (resize, fill_color, image_filter, transition_type, step, duration, fps, angle,
+    position); fill_color and image_filter are None when no fill color or filter was picked.
+    Numeric fields are returned as the strings passed to swww.
+    """
+    # One RNG call feeds every field: each takes its own slice of the bits. The slices
+    # are much wider than the tables, so the bias left by the modulo is well under 1%.
+    bits = random.getrandbits(_RANDOM_BITS)
+    mask, width, pick = _FIELD_MASK, _FIELD_BITS, _weighted_pick
+    steps, durations, fps = _TRANSITION_STEPS, _DURATION_STRS, _FPS_STRS
 
     # Generate random values with realistic ranges
-    transition_step = random.choice([
-        # Fast transitions
-        200, 220, 240, 255,
-        # Medium transitions
-        120, 140, 160, 180,
-        # Slow transitions (less common)
-        60, 80, 100
-    ])
-
-    transition_duration = random.choice([
-        # Quick transitions (most common)
-        0.5, 0.8, 1.0, 1.2, 1.5,
-        # Medium transitions
-        2.0, 2.5, 3.0,
-        # Slow transitions (rare)
-        4.0, 5.0
-    ])
-
-    transition_fps = random.choice([
-        # High FPS (smooth)
-        60, 60, 60
-    ])
+    transition_step = _STEP_STRS[steps[(bits & mask) % len(steps)]]
+    transition_duration = durations[(bits >> width & mask) % len(durations)]
+    transition_fps = fps[(bits >> 2 * width & mask) % len(fps)]
 
     # Special angle handling for specific transition types
-    selected_transition = get_random_element(transition_types)
+    selected_transition = _ALL_TRANSITIONS[(bits >> 3 * width & mask) % len(_ALL_TRANSITIONS)]
 
-    if selected_transition in ["wipe", "wave", "spiral"]:
+    angle_bits = bits >> 4 * width & _ANGLE_MASK
+    if selected_transition in _ANGLE_FREE:
         # These transitions benefit from varied angles
-        transition_angle = random.randint(0, 359)
-    elif selected_transition in ["grow", "center", "outer"]:
+        transition_angle = _ANGLE_STRS[angle_bits % 360]
+    elif selected_transition in _ANGLE_CARDINAL:
         # These work well with cardinal angles
-        transition_angle = random.choice([0, 45, 90, 135, 180, 225, 270, 315])
+        transition_angle = _ANGLE_STRS[_CARDINAL_ANGLES[angle_bits % len(_CARDINAL_ANGLES)]]
     else:
         # Default random angle
-        transition_angle = random.randint(0, 359)
+        transition_angle = _ANGLE_STRS[angle_bits % 360]
+
+    bits >>= 4 * width + _ANGLE_BITS
+    resize = pick(_RESIZE_POP, _RESIZE_CDF, bits & mask)
+    image_filter = pick(_FILTER_POP, _FILTER_CDF, bits >> width & mask)
+    fill_color = pick(_FILL_POP, _FILL_CDF, bits >> 2 * width & mask)
+    # Only the rare coordinate positions draw again, for the coordinates themselves
+    position = random_transition_position(bits >> 3 * width & mask)
+
+    return (resize, fill_color, image_filter, selected_transition, transition_step,
+            transition_duration, transition_fps, transition_angle, position)
 
+def generate_random_swww_options():
+    """Generate random transition options for swww with enhanced variety"""
+    (resize, fill_color, image_filter, transition_type, step, duration, fps, angle,
+     position) = _draw_random_fields()
     options = {
-        "resize": get_random_element(resize_options),
-        "transitionType": selected_transition,
-        "transitionStep": transition_step,
-        "transitionDuration": transition_duration,
-        "transitionFps": transition_fps,
-        "transitionAngle": transition_angle,
-        "transitionPos": get_random_element(positions),
-        "filter": get_random_element(filters),
-        "fillColor": get_random_element(fill_colors)
+        "resize": resize,
+        "transitionType": transition_type,
+        "transitionStep": step,
+        "transitionDuration": duration,
+        "transitionFps": fps,
+        "transitionAngle": angle,
+        "transitionPos": position
     }
 
-    # Remove None values
-    options = {k: v for k, v in options.items() if v is not None}
+    # Filter and fill color are optional; only add them when one was picked
+    if image_filter is not None:
+        options["filter"] = image_filter
+    if fill_color is not None:
+        options["fillColor"] = fill_color
 
     return options
 
+# Transition choices for the themed presets
+_SMOOTH_TYPES = ("fade", "grow", "center")
+_DRAMATIC_TYPES = ("wipe", "wave", "spiral")
+_DYNAMIC_TYPES = ("left", "right", "top", "bottom", "diagonal")
+_THEMED_POSITIONS = ("center", "top-left", "top-right", "bottom-left", "bottom-right")
+
+# Each preset draws (transition_type, step, duration, fps, angle); angle is None for
+# presets without one. Like _draw_random_fields, numeric fields are swww-ready strings.
+def _draw_smooth(_choice=random.choice, _randint=random.randint, _uniform=random.uniform):
+    """Slow, gentle transitions"""
+    return _choice(_SMOOTH_TYPES), _STEP_STRS[_randint(180, 255)], str(_uniform(1.5, 3.0)), "60", None
+
+def _draw_dramatic(_choice=random.choice, _randint=random.randint, _uniform=random.uniform):
+    """Fast sweeping transitions at a random angle"""
+    return (_choice(_DRAMATIC_TYPES), _STEP_STRS[_randint(200, 255)],
+            str(_uniform(0.5, 1.5)), "60", _ANGLE_STRS[_randint(0, 359)])
+
+def _draw_minimal():
+    """A plain one-second fade"""
+    return "fade", "255", "1.0", "30", None
+
+def _draw_dynamic(_choice=random.choice, _randint=random.randint, _uniform=random.uniform):
+    """Directional slides at medium speed"""
+    return _choice(_DYNAMIC_TYPES), _STEP_STRS[_randint(150, 220)], str(_uniform(0.8, 2.0)), "60", None
+
+# Preset themes; "random" and unknown themes fall back to fully random options
+_THEME_DRAWS = {
+    "smooth": _draw_smooth,
+    "dramatic": _draw_dramatic,
+    "minimal": _draw_minimal,
+    "dynamic": _draw_dynamic,
+}
+
+def _draw_theme_fields(theme):
+    """Draw the fields of a preset theme, or return None for "random" or an unknown theme"""
+    # Only the chosen preset runs, so no other theme draws random values
+    draw = _THEME_DRAWS.get(theme)
+    return None if draw is None else draw()
+
 def generate_themed_transition(theme="random"):
     """Generate transition options based on a theme"""
-    themes = {
-        "smooth": {
-            "transitionType": random.choice(["fade", "grow", "center"]),
-            "transitionStep": random.randint(180, 255),
-            "transitionDuration": random.uniform(1.5, 3.0),
-            "transitionFps": 60
-        },
-        "dramatic": {
-            "transitionType": random.choice(["wipe", "wave", "spiral"]),
-            "transitionStep": random.randint(200, 255),
-            "transitionDuration": random.uniform(0.5, 1.5),
-            "transitionFps": random.choice([60, 60]),
-            "transitionAngle": random.randint(0, 359)
-        },
-        "minimal": {
-            "transitionType": "fade",
-            "transitionStep": 255,
-            "transitionDuration": 1.0,
-            "transitionFps": 30
-        },
-        "dynamic": {
-            "transitionType": random.choice(["left", "right", "top", "bottom", "diagonal"]),
-            "transitionStep": random.randint(150, 220),
-            "transitionDuration": random.uniform(0.8, 2.0),
-            "transitionFps": random.choice([60, 60])
-        }
-    }
-
-    if theme == "random" or theme not in themes:
+    fields = _draw_theme_fields(theme)
+    if fields is None:
         return generate_random_swww_options()
 
-    base_options = themes[theme].copy()
-    base_options.update({
-        "resize": "crop",
-        "transitionPos": random.choice(["center", "top-left", "top-right", "bottom-left", "bottom-right"])
-    })
+    transition_type, step, duration, fps, angle = fields
+    base_options = {
+        "transitionType": transition_type,
+        "transitionStep": step,
+        "transitionDuration": duration,
+        "transitionFps": fps
+    }
+    if angle is not None:
+        base_options["transitionAngle"] = angle
+
+    base_options["resize"] = "crop"
+    base_options["transitionPos"] = random.choice(_THEMED_POSITIONS)
 
     return base_options
 
+def build_themed_command(image_path, theme="random"):
+    """Build the swww command for a theme in one pass, without an intermediate options dict
+
+    Returns the command and the (transition_type, step, duration) shown in the banner.
+    """
+    fields = _draw_theme_fields(theme)
+    if fields is None:
+        (resize, fill_color, image_filter, transition_type, step, duration, fps, angle,
+         position) = _draw_random_fields()
+    else:
+        transition_type, step, duration, fps, angle = fields
+        resize, fill_color, image_filter = "crop", None, None
+        position = random.choice(_THEMED_POSITIONS)
+
+    # Flags are appended in the same order as _FLAG_SPEC, so the command matches
+    # create_swww_command for the equivalent options
+    command = ["swww", "img", image_path, "--resize", resize]
+    if fill_color is not None:
+        command += ("--fill-color", fill_color)
+    if image_filter is not None:
+        command += ("-f", image_filter)
+    command += ("--transition-type", transition_type,
+                "--transition-step", step,
+                "--transition-duration", duration,
+                "--transition-fps", fps)
+    if angle is not None:
+        command += ("--transition-angle", angle)
+    command += ("--transition-pos", position)
+
+    return command, (transition_type, step, duration)
+
+def run_swww(command):
+    """Run a swww command with posix_spawnp and wait for it, returning whether it succeeded"""
+    try:
+        pid = os.posix_spawnp(command[0], command, os.environ)
+        _, status = os.waitpid(pid, 0)
+    except OSError as e:
+        print(f"Error executing swww command: {e}")
+        return False
+
+    exit_code = os.waitstatus_to_exitcode(status)
+    if exit_code != 0:
+        print(f"Error executing swww command: {' '.join(command)} returned non-zero exit status {exit_code}")
+        return False
+    return True
+
 def set_wallpaper(wallpaper_path, theme="random"):
     """Set the wallpaper using swww with random transition effects"""
-    options = generate_themed_transition(theme)
-    command = create_swww_command(wallpaper_path, options)
+    command, (transition_type, step, duration) = build_themed_command(wallpaper_path, theme)
 
     # Print the transition info
-    print(f"🎨 Transition: {options.get('transitionType', 'fade')}")
-    print(f"⚡ Speed: {options.get('transitionStep', 255)}")
-    print(f"⏱️  Duration: {options.get('transitionDuration', 1)}s")
+    if _TTY:
+        sys.stdout.write(
+            f"\N{ARTIST PALETTE} Transition: {transition_type}\n"
+            f"\N{HIGH VOLTAGE SIGN} Speed: {step}\n"
+            f"\N{STOPWATCH}\N{VARIATION SELECTOR-16}  Duration: {duration}s\n"
+        )
+        sys.stdout.flush()
 
     # Execute the command
-    try:
-        subprocess.run(command, check=True)
-        return True
-    except subprocess.CalledProcessError as e:
-        print(f"Error executing swww command: {e}")
-        return False
-
-def parse_command_line_args():
-    """Parse command line arguments"""
+    return run_swww(command)
+
+_THEME_CHOICES = ("random", "smooth", "dramatic", "minimal", "dynamic")
+
+# Command line flag -> (attribute, converter); a converter of True marks a switch
+_ARGS = {
+    "--theme": ("theme", str),
+    "--transition-type": ("transitionType", str),
+    "--transition-step": ("transitionStep", float),
+    "--transition-duration": ("transitionDuration", float),
+    "--transition-fps": ("transitionFps", int),
+    "--transition-angle": ("transitionAngle", float),
+    "--transition-position": ("transitionPos", str),
+    "--filter": ("filter", str),
+    "--no-resize": ("noResize", True),
+    "--resize": ("resize", str),
+    "--fill-color": ("fillColor", str),
+    "--random": ("random", True),
+    "--list-transitions": ("list_transitions", True),
+}
+
+@functools.lru_cache(maxsize=None)
+def _build_parser():
+    """Build the command line parser once, on first use"""
+    # Imported here so library users of this module never load argparse
     import argparse
     parser = argparse.ArgumentParser(description="Enhanced helper script for setting wallpapers with swww")
     parser.add_argument("image_path", help="Path to the wallpaper image")
-    parser.add_argument("--theme", choices=["random", "smooth", "dramatic", "minimal", "dynamic"],
+    parser.add_argument("--theme", choices=_THEME_CHOICES,
                        default="random", help="Transition theme")
     parser.add_argument("--transition-type", dest="transitionType", help="Specific transition type")
     parser.add_argument("--transition-step", dest="transitionStep", type=float, help="Transition step size (0-255)")
@@ -237,22 +409,87 @@ def parse_command_line_args():
     parser.add_argument("--fill-color", dest="fillColor", help="Fill color for letterboxing")
     parser.add_argument("--random", action="store_true", help="Use completely random transition effects")
     parser.add_argument("--list-transitions", action="store_true", help="List all available transition types")
-
-    return parser.parse_args()
+    return parser
+
+def _is_negative_number(token):
+    """Match argparse's negative number pattern (-5, -0.5, -.5) without importing re"""
+    whole, dot, fraction = token[1:].partition(".")
+    if dot:
+        return fraction.isdecimal() and (not whole or whole.isdecimal())
+    return whole.isdecimal()
+
+# Namespace attributes that select what to do rather than a swww option
+_META_KEYS = frozenset(("image_path", "random", "theme", "list_transitions"))
+
+def _parse_args_fast(argv):
+    """Parse argv with the _ARGS table, or return None to leave it to argparse"""
+    args = SimpleNamespace(image_path=None, **{
+        attr: False if convert is True else None for attr, convert in _ARGS.values()
+    })
+    args.theme = "random"
+
+    tokens = iter(argv)
+    for token in tokens:
+        if not token.startswith("-"):
+            if args.image_path is not None:
+                return None
+            args.image_path = token
+            continue
+
+        # Help, abbreviations and anything unknown go through argparse
+        flag, has_value, value = token.partition("=")
+        spec = _ARGS.get(flag)
+        if spec is None:
+            return None
+
+        attr, convert = spec
+        if convert is True:
+            if has_value:
+                return None
+            setattr(args, attr, True)
+            continue
+
+        if not has_value:
+            value = next(tokens, None)
+            # A missing value, or a flag where the value should be, is argparse's error to report.
+            # Like argparse, a dash-led token only counts as a value when it is a negative number.
+            if value is None or (value.startswith("-") and not _is_negative_number(value)):
+                return None
+        try:
+            setattr(args, attr, convert(value))
+        except ValueError:
+            return None
+
+    if args.theme not in _THEME_CHOICES:
+        return None
+    # Listing transitions does not need an image
+    if args.image_path is None and not args.list_transitions:
+        return None
+    return args
+
+def parse_command_line_args(argv=None):
+    """Parse command line arguments"""
+    if argv is None:
+        argv = sys.argv[1:]
+    # argparse only runs for --help or to report a bad command line
+    args = _parse_args_fast(argv)
+    if args is None:
+        args = _build_parser().parse_args(argv)
+    return args
 
 def list_available_transitions():
     """List all available transition types"""
-    transitions = [
-        "fade", "left", "right", "top", "bottom",
-        "wipe", "wave", "grow", "center", "outer",
-        "top-left", "top-right", "bottom-left", "bottom-right",
-        "center-out", "outer-in", "spiral", "diamond", "hexagon"
-    ]
-
-    print("Available transition types:")
-    for i, transition in enumerate(transitions, 1):
-        print(f"  {i:2d}. {transition}")
-    print(f"\nTotal: {len(transitions)} transitions available")
+    # Nothing to write to when the script was started with stdout closed
+    if sys.stdout is None:
+        return
+
+    # Build the whole listing first and write it in one call
+    body = "\n".join(f"  {i:2d}. {transition}" for i, transition in enumerate(_ALL_TRANSITIONS, 1))
+    sys.stdout.write(
+        f"Available transition types:\n{body}\n"
+        f"\nTotal: {len(_ALL_TRANSITIONS)} transitions available\n"
+    )
+    sys.stdout.flush()
 
 if __name__ == "__main__":
     # Parse command line arguments
@@ -264,26 +501,28 @@ if __name__ == "__main__":
         sys.exit(0)
 
     # Get options from arguments or generate themed/random ones
-    if args.random:
-        options = generate_random_swww_options()
-    elif hasattr(args, 'theme') and args.theme != "random":
-        options = generate_themed_transition(args.theme)
+    if args.random or args.theme != "random":
+        # Random and themed options are built straight into the command
+        command, _ = build_themed_command(args.image_path, "random" if args.random else args.theme)
     else:
-        # Convert argparse Namespace to dictionary, filtering out None values
+        # Only explicitly given options: unset values are None and unset switches False
         options = {k: v for k, v in vars(args).items()
-                  if v is not None and k not in ['image_path', 'random', 'theme', 'list_transitions']}
+                  if v is not None and v is not False and k not in _META_KEYS}
 
         # If no specific options provided, use themed generation
-        if not options:
-            options = generate_themed_transition(getattr(args, 'theme', 'random'))
+        if options:
+            command = create_swww_command(args.image_path, options)
+        else:
+            command, _ = build_themed_command(args.image_path, args.theme)
 
     # Execute the command
-    command = create_swww_command(args.image_path, options)
-    print(f"🚀 Executing: {' '.join(command)}")
+    if _TTY:
+        print("\N{ROCKET} Executing:", " ".join(command))
 
     try:
         exec_async(command)
-        print("✅ Wallpaper application started successfully!")
+        if _TTY:
+            print("\N{WHITE HEAVY CHECK MARK} Wallpaper application started successfully!")
     except Exception as e:
-        print(f"❌ Error: {e}")
+        print(f"\N{CROSS MARK} Error: {e}")
         sys.exit(1)